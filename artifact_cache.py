@@ -0,0 +1,136 @@
+# artifact_cache.py
+
+import os
+import json
+import hashlib
+import inspect
+
+# 캐시 키 형식이 바뀌면 올려서 기존 산출물을 모두 무효화합니다.
+CACHE_VERSION = 2
+MANIFEST_NAME = ".artifact_manifest.json"
+
+
+def load_manifest(result_dir):
+    """
+    result_dir의 manifest를 읽어 {artifact 이름: {"key": ..., "outputs": {경로: 지문}}} 를 반환합니다.
+    지문은 산출물의 {"sha256", "size", "mtime_ns"} 입니다.
+    없거나 손상된 경우 빈 dict를 반환합니다.
+    """
+    path = os.path.join(result_dir, MANIFEST_NAME)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _stat_matches(path, fingerprint):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size == fingerprint.get("size") and st.st_mtime_ns == fingerprint.get("mtime_ns")
+
+
+def _fingerprint(path):
+    st = os.stat(path)
+    return {"sha256": _sha256(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def output_versions(result_dir):
+    """
+    산출물 파일명 -> 내용 해시 앞 12자리 매핑. (URL cache-busting 용도)
+    기록 이후 파일이 바뀐 경우(git pull 등, 크기/mtime 불일치)는 제외하여
+    호출 측이 다른 버전 값을 쓰도록 합니다. 요청 경로이므로 파일을 해시하지 않습니다.
+    """
+    versions = {}
+    for entry in load_manifest(result_dir).values():
+        outputs = entry.get("outputs")
+        if not isinstance(outputs, dict):
+            continue
+        for output, fingerprint in outputs.items():
+            filename = os.path.basename(output)
+            # manifest 경로는 학습 시 cwd 기준이므로 result_dir 기준으로 다시 찾음
+            if _stat_matches(os.path.join(result_dir, filename), fingerprint):
+                versions[filename] = fingerprint["sha256"][:12]
+    return versions
+
+
+class ArtifactCache:
+    def __init__(self, result_dir):
+        """
+        입력 데이터 해시, 코드 버전, 파라미터로 만든 키가 같으면 산출물 재생성을 건너뜁니다.
+
+        Args:
+            result_dir (str): 산출물과 manifest가 저장되는 디렉터리.
+        """
+        self.result_dir = result_dir
+        self.manifest = load_manifest(result_dir)
+        self._file_hashes = {}
+
+    def file_hash(self, path):
+        """
+        파일 내용의 sha256. 한 실행 안에서는 같은 파일을 다시 읽지 않습니다.
+        """
+        if path not in self._file_hashes:
+            self._file_hashes[path] = _sha256(path)
+        return self._file_hashes[path]
+
+    def key(self, files=(), funcs=(), params=None, deps=()):
+        """
+        Args:
+            files: 입력 데이터 파일 경로들 (내용 해시 사용).
+            funcs: 산출물을 만드는 함수들 (소스 코드 해시 사용).
+            params: JSON 직렬화 가능한 하이퍼파라미터/설정.
+            deps: 의존하는 다른 산출물의 키.
+        Returns:
+            str: sha256 hex digest.
+        """
+        h = hashlib.sha256()
+        h.update(f"v{CACHE_VERSION}".encode())
+        for path in files:
+            h.update(self.file_hash(path).encode())
+        for func in funcs:
+            h.update(inspect.getsource(func).encode())
+        h.update(json.dumps(params, sort_keys=True, default=str).encode())
+        for dep in deps:
+            h.update(dep.encode())
+        return h.hexdigest()
+
+    def is_fresh(self, name, key, outputs):
+        """
+        manifest의 키가 일치하고, 모든 산출물이 기록 당시와 같은 내용이면 True.
+        크기/mtime이 같으면 해시를 생략하고, 다르면(git checkout 등) 내용 해시로 비교합니다.
+        """
+        entry = self.manifest.get(name)
+        if entry is None or entry.get("key") != key:
+            return False
+        recorded = entry.get("outputs")
+        if not isinstance(recorded, dict) or set(recorded) != set(outputs):
+            return False
+        for path in outputs:
+            fingerprint = recorded[path]
+            if _stat_matches(path, fingerprint):
+                continue
+            if not os.path.exists(path) or _sha256(path) != fingerprint.get("sha256"):
+                return False
+        return True
+
+    def record(self, name, key, outputs):
+        self.manifest[name] = {"key": key, "outputs": {p: _fingerprint(p) for p in outputs}}
+        self.save()
+
+    def save(self):
+        path = os.path.join(self.result_dir, MANIFEST_NAME)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
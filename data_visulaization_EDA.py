@@ -1,17 +1,17 @@
 # -*- coding: utf-8 -*-
 """
 데이터 시각화 및 탐색적 데이터 분석, 모델 학습 및 평가, 그리고 평가 지표 플롯 그리기
+
+seaborn / matplotlib / plotly 는 실제로 그림을 그릴 때만 import 합니다.
+(powertwin.py train 등에서 이 모듈을 import 하는 비용을 줄이기 위함)
 """
 
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
-import seaborn as sns
 import datetime as dt
-import matplotlib.pyplot as plt
-
-# Plotly 관련 (노트북 환경에서 interactive plot을 원할 때 사용)
-from plotly.offline import init_notebook_mode
-init_notebook_mode()
 
 # scikit-learn 관련 라이브러리
 from sklearn.linear_model import LinearRegression
@@ -27,60 +27,100 @@ from sklearn.metrics import (
 # 모델 저장용 joblib
 import joblib
 
+from artifact_cache import ArtifactCache
+
+TRAIN_POWER_CSV = './dataset/train/power.csv'
+TRAIN_WEATHER_CSV = './dataset/train/weather.csv'
+RESULT_DIR = './static/result'
+TRAIN_RESULT_PATH = f'{RESULT_DIR}/.train_result.pkl'  # 재학습 없이 평가 플롯을 다시 그리기 위한 캐시
+
+# 학습 파라미터 (변경 시 캐시 키가 바뀌어 재학습됩니다)
+FEATURES = ['Temp_max', 'Temp_min', 'Dew_max', 'Precipit']
+TEST_SIZE = 0.3
+RANDOM_STATE = 0
+SVR_PARAMS = dict(C=11, epsilon=1, kernel='rbf', gamma=3, tol=0.001, verbose=0)
+
+
+def _init_notebook_plotting():
+    """
+    노트북 환경에서 interactive plot을 원할 때만 Plotly를 초기화합니다.
+    """
+    if "IPython" in sys.modules:
+        from plotly.offline import init_notebook_mode
+        init_notebook_mode()
+
+
 ### 1. 데이터 로드 및 전처리 ###
-# CSV 파일 읽기
-df_usage = pd.read_csv('./dataset/train/power.csv')
-df_weather = pd.read_csv('./dataset/train/weather.csv')
-
-# --- df_usage 날짜 처리 ---
-n = df_usage.shape[0]
-p1 = pd.Series(range(n), pd.period_range('2016-06-01 00:00:00', freq='1H', periods=n))
-df_usage['StartDate'] = p1.to_frame().index
-df_usage['StartDate'] = df_usage['StartDate'].apply(lambda x: x.to_timestamp())
-df_usage['Date'] = pd.DatetimeIndex(df_usage['StartDate']).date
-
-# --- df_weather 날짜 처리 ---
-m = df_weather.shape[0]
-p2 = pd.Series(range(m), pd.period_range('2016-06-01', freq='1D', periods=m))
-df_weather['Date'] = p2.to_frame().index
-df_weather['Date'] = df_weather['Date'].apply(lambda x: x.to_timestamp())
-
-# --- 일별 전력 사용량 집계 ---
-df_usage_daily = df_usage.groupby('Date').sum(numeric_only=True)
-df_usage_daily['day_of_week'] = df_usage_daily['day_of_week'].apply(lambda x: x / 24)
-notes_col = df_usage.groupby('Date').first()['notes'].values
-df_usage_daily['notes'] = notes_col
-
-# --- weather 데이터와 결합 ---
-k = df_usage_daily.shape[0]
-df1 = df_usage_daily['Value (kWh)'].values
-comb_df = df_weather.iloc[0:k].copy()
-comb_df['kWh_usage'] = pd.Series(df1).to_frame()
-comb_df['notes'] = notes_col
-
-# 상관분석에 사용할 데이터프레임 (문자열 컬럼 제외 후)
-corr_df = comb_df[['Temp_max', 'Temp_min', 'Dew_max', 'Dew_min', 'kWh_usage', 'notes']]
-
-# --- 24시간 단위로 전력 사용량 분할 (예: 하루치 배열) ---
-power_split = df_usage['Value (kWh)'].values
-split_data_power = [power_split[x:x+24] for x in range(0, len(power_split), 24)]
-comb_df['power_array_nsaled'] = pd.Series(split_data_power).to_frame()
+def load_data(power_csv=TRAIN_POWER_CSV, weather_csv=TRAIN_WEATHER_CSV):
+    """
+    전력/날씨 CSV를 읽어 일별로 결합한 comb_df와 상관분석용 corr_df를 반환합니다.
+    """
+    # CSV 파일 읽기
+    df_usage = pd.read_csv(power_csv)
+    df_weather = pd.read_csv(weather_csv)
+
+    # --- df_usage 날짜 처리 ---
+    n = df_usage.shape[0]
+    p1 = pd.Series(range(n), pd.period_range('2016-06-01 00:00:00', freq='1H', periods=n))
+    df_usage['StartDate'] = p1.to_frame().index
+    df_usage['StartDate'] = df_usage['StartDate'].apply(lambda x: x.to_timestamp())
+    df_usage['Date'] = pd.DatetimeIndex(df_usage['StartDate']).date
+
+    # --- df_weather 날짜 처리 ---
+    m = df_weather.shape[0]
+    p2 = pd.Series(range(m), pd.period_range('2016-06-01', freq='1D', periods=m))
+    df_weather['Date'] = p2.to_frame().index
+    df_weather['Date'] = df_weather['Date'].apply(lambda x: x.to_timestamp())
+
+    # --- 일별 전력 사용량 집계 ---
+    df_usage_daily = df_usage.groupby('Date').sum(numeric_only=True)
+    df_usage_daily['day_of_week'] = df_usage_daily['day_of_week'].apply(lambda x: x / 24)
+    notes_col = df_usage.groupby('Date').first()['notes'].values
+    df_usage_daily['notes'] = notes_col
+
+    # --- weather 데이터와 결합 ---
+    k = df_usage_daily.shape[0]
+    df1 = df_usage_daily['Value (kWh)'].values
+    comb_df = df_weather.iloc[0:k].copy()
+    comb_df['kWh_usage'] = pd.Series(df1).to_frame()
+    comb_df['notes'] = notes_col
+
+    # 상관분석에 사용할 데이터프레임 (문자열 컬럼 제외 후)
+    corr_df = comb_df[['Temp_max', 'Temp_min', 'Dew_max', 'Dew_min', 'kWh_usage', 'notes']]
+
+    # --- 24시간 단위로 전력 사용량 분할 (예: 하루치 배열) ---
+    power_split = df_usage['Value (kWh)'].values
+    split_data_power = [power_split[x:x+24] for x in range(0, len(power_split), 24)]
+    comb_df['power_array_nsaled'] = pd.Series(split_data_power).to_frame()
+
+    return comb_df, corr_df
+
 
 ### 2. EDA: PairGrid 및 Heatmap 저장 ###
-# PairGrid: 각 변수의 분포 및 변수간 관계 (notes에 따라 색 구분)
-g = sns.PairGrid(corr_df, hue="notes")
-g.map_diag(plt.hist)
-g.map_offdiag(plt.scatter)
-g.add_legend()
-g.savefig('./static/result/pairplot.png')
-plt.close()
-
-# Heatmap: 수치형 변수들 간 상관계수 (notes 컬럼 제외)
-plt.figure(figsize=(10, 10))
-sns.heatmap(corr_df.drop(columns='notes').corr(), annot=True, cmap='coolwarm', annot_kws={"color": "black", "size": 12})
-plt.tight_layout()
-plt.savefig('./static/result/heatmap.png')
-plt.close()
+def plot_pairplot(corr_df, path=f'{RESULT_DIR}/pairplot.png'):
+    # PairGrid: 각 변수의 분포 및 변수간 관계 (notes에 따라 색 구분)
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
+    g = sns.PairGrid(corr_df, hue="notes")
+    g.map_diag(plt.hist)
+    g.map_offdiag(plt.scatter)
+    g.add_legend()
+    g.savefig(path)
+    plt.close()
+
+
+def plot_heatmap(corr_df, path=f'{RESULT_DIR}/heatmap.png'):
+    # Heatmap: 수치형 변수들 간 상관계수 (notes 컬럼 제외)
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 10))
+    sns.heatmap(corr_df.drop(columns='notes').corr(), annot=True, cmap='coolwarm', annot_kws={"color": "black", "size": 12})
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
 
 ### 3. 모델 학습 및 평가 ###
 # 평가 지표 계산 함수
@@ -104,79 +144,205 @@ def evaluation(model_name, y_pred, y_true):
     row_index = ['Exp_Var_Score', 'Max_Error', 'MSE', 'MAE', 'R2_Score', 'Median_Abs_Error']
     return pd.DataFrame(data, columns=[model_name], index=row_index)
 
-# 특성과 타깃 설정 (예: 날씨 정보로 전력 사용량 예측)
-X_new = comb_df[['Temp_max', 'Temp_min', 'Dew_max', 'Precipit']]
-y_new = comb_df['kWh_usage'].values
-
-# Train/Test split
-X_train_new, X_test_new, y_train_new, y_test_new = train_test_split(X_new, y_new, test_size=0.3, random_state=0)
-
-# --- Linear Regression 모델 ---
-lr = LinearRegression()
-lr.fit(X_train_new, y_train_new)
-y_pred_lr_new = lr.predict(X_test_new)
-print('Linear Regression Intercept:', lr.intercept_)
-print('Linear Regression Coefficients:', lr.coef_)
-df_linear = evaluation('Linear Regression', y_pred_lr_new, y_test_new)
-print(df_linear)
-
-# --- SVR Pipeline 모델 ---
-svr = SVR(C=11, epsilon=1, kernel='rbf', gamma=3, tol=0.001, verbose=0)
-pipe = Pipeline([
-    ('StandardScaler', StandardScaler()),
-    ('SVR', svr)
-])
-pipe.fit(X_train_new, y_train_new)
-y_pred_svr = pipe.predict(X_test_new)
-df_svr = evaluation('SVR', y_pred_svr, y_test_new)
-print(df_svr)
-
-# 샘플 예측 확인
-print("Sample Test Inputs (first 10):")
-print(X_test_new.head(10))
-print("Linear Regression Predictions (first 10):")
-print(lr.predict(X_test_new.head(10).values))
-print("SVR Predictions (first 10):")
-print(pipe.predict(X_test_new.head(10).values))
-print("Actual kWh Usage (first 10):")
-print(y_test_new[:10])
-
-# 모델 저장 (joblib 사용)
-joblib.dump(lr, './static/result/linear_regression_model.pkl')
-print("Linear Regression model saved as './static/result/linear_regression_model.pkl'.")
-joblib.dump(pipe, './static/result/svr_pipeline_model.pkl')
-print("SVR Pipeline model saved as './static/result/svr_pipeline_model.pkl'.")
+
+def train_models(comb_df):
+    """
+    Linear Regression / SVR Pipeline 모델을 학습, 평가하고 저장합니다.
+    플롯에 필요한 테스트셋과 예측값, 평가 지표를 dict로 반환합니다.
+    """
+    # 특성과 타깃 설정 (예: 날씨 정보로 전력 사용량 예측)
+    X_new = comb_df[FEATURES]
+    y_new = comb_df['kWh_usage'].values
+
+    # Train/Test split
+    X_train_new, X_test_new, y_train_new, y_test_new = train_test_split(X_new, y_new, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+    # --- Linear Regression 모델 ---
+    lr = LinearRegression()
+    lr.fit(X_train_new, y_train_new)
+    y_pred_lr_new = lr.predict(X_test_new)
+    print('Linear Regression Intercept:', lr.intercept_)
+    print('Linear Regression Coefficients:', lr.coef_)
+    df_linear = evaluation('Linear Regression', y_pred_lr_new, y_test_new)
+    print(df_linear)
+
+    # --- SVR Pipeline 모델 ---
+    svr = SVR(**SVR_PARAMS)
+    pipe = Pipeline([
+        ('StandardScaler', StandardScaler()),
+        ('SVR', svr)
+    ])
+    pipe.fit(X_train_new, y_train_new)
+    y_pred_svr = pipe.predict(X_test_new)
+    df_svr = evaluation('SVR', y_pred_svr, y_test_new)
+    print(df_svr)
+
+    # 샘플 예측 확인
+    print("Sample Test Inputs (first 10):")
+    print(X_test_new.head(10))
+    print("Linear Regression Predictions (first 10):")
+    print(lr.predict(X_test_new.head(10).values))
+    print("SVR Predictions (first 10):")
+    print(pipe.predict(X_test_new.head(10).values))
+    print("Actual kWh Usage (first 10):")
+    print(y_test_new[:10])
+
+    # 모델 저장 (joblib 사용)
+    joblib.dump(lr, f'{RESULT_DIR}/linear_regression_model.pkl')
+    print(f"Linear Regression model saved as '{RESULT_DIR}/linear_regression_model.pkl'.")
+    joblib.dump(pipe, f'{RESULT_DIR}/svr_pipeline_model.pkl')
+    print(f"SVR Pipeline model saved as '{RESULT_DIR}/svr_pipeline_model.pkl'.")
+
+    return {
+        "y_test": y_test_new,
+        "y_pred_lr": y_pred_lr_new,
+        "y_pred_svr": y_pred_svr,
+        "df_linear": df_linear,
+        "df_svr": df_svr,
+    }
+
 
 ### 4. 평가 지표 및 예측 결과 플롯 ###
-# (1) 평가 지표를 바 차트로 비교 플롯하기
-metrics_df = pd.concat([df_linear, df_svr], axis=1)
-plt.figure(figsize=(10, 6))
-metrics_df.plot(kind='bar', rot=45)
-plt.title("Evaluation Metrics Comparison")
-plt.ylabel("Metric Value")
-plt.tight_layout()
-plt.savefig('./static/result/evaluation_metrics.png')
-plt.show()
-
-# (2) 실제 값과 예측 값의 산점도 플롯 (각 모델별)
-plt.figure(figsize=(12, 5))
-
-# Linear Regression 산점도
-plt.subplot(1, 2, 1)
-plt.scatter(y_test_new, y_pred_lr_new, alpha=0.7, color='blue')
-plt.plot([min(y_test_new), max(y_test_new)], [min(y_test_new), max(y_test_new)], color='red', linestyle='--')
-plt.xlabel("Actual kWh Usage")
-plt.ylabel("Predicted kWh Usage")
-plt.title("Linear Regression: Actual vs Predicted")
-
-# SVR 산점도
-plt.subplot(1, 2, 2)
-plt.scatter(y_test_new, y_pred_svr, alpha=0.7, color='green')
-plt.plot([min(y_test_new), max(y_test_new)], [min(y_test_new), max(y_test_new)], color='red', linestyle='--')
-plt.xlabel("Actual kWh Usage")
-plt.ylabel("Predicted kWh Usage")
-plt.title("SVR: Actual vs Predicted")
-
-plt.tight_layout()
-plt.savefig('./static/result/actual_vs_predicted.png')
-plt.show()
\ No newline at end of file
+def plot_evaluation_metrics(df_linear, df_svr, path=f'{RESULT_DIR}/evaluation_metrics.png', show=True):
+    # (1) 평가 지표를 바 차트로 비교 플롯하기
+    import matplotlib.pyplot as plt
+
+    metrics_df = pd.concat([df_linear, df_svr], axis=1)
+    plt.figure(figsize=(10, 6))
+    metrics_df.plot(kind='bar', rot=45)
+    plt.title("Evaluation Metrics Comparison")
+    plt.ylabel("Metric Value")
+    plt.tight_layout()
+    plt.savefig(path)
+    if show:
+        plt.show()
+    plt.close('all')
+
+
+def plot_actual_vs_predicted(y_test_new, y_pred_lr_new, y_pred_svr, path=f'{RESULT_DIR}/actual_vs_predicted.png', show=True):
+    # (2) 실제 값과 예측 값의 산점도 플롯 (각 모델별)
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 5))
+
+    # Linear Regression 산점도
+    plt.subplot(1, 2, 1)
+    plt.scatter(y_test_new, y_pred_lr_new, alpha=0.7, color='blue')
+    plt.plot([min(y_test_new), max(y_test_new)], [min(y_test_new), max(y_test_new)], color='red', linestyle='--')
+    plt.xlabel("Actual kWh Usage")
+    plt.ylabel("Predicted kWh Usage")
+    plt.title("Linear Regression: Actual vs Predicted")
+
+    # SVR 산점도
+    plt.subplot(1, 2, 2)
+    plt.scatter(y_test_new, y_pred_svr, alpha=0.7, color='green')
+    plt.plot([min(y_test_new), max(y_test_new)], [min(y_test_new), max(y_test_new)], color='red', linestyle='--')
+    plt.xlabel("Actual kWh Usage")
+    plt.ylabel("Predicted kWh Usage")
+    plt.title("SVR: Actual vs Predicted")
+
+    plt.tight_layout()
+    plt.savefig(path)
+    if show:
+        plt.show()
+    plt.close('all')
+
+
+def _render(func, *args, **kwargs):
+    """
+    워커 프로세스에서 GUI 없이(Agg) 플롯 함수를 실행합니다.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    func(*args, **kwargs)
+
+
+def main(show=True, force=False, jobs=None):
+    """
+    입력 데이터/코드/파라미터가 바뀐 산출물만 다시 만듭니다.
+    독립적인 플롯은 워커 프로세스에서 병렬로 렌더링하고, 그동안 메인 프로세스에서 학습합니다.
+
+    Args:
+        show (bool): 평가 플롯을 plt.show()로 띄울지 여부 (True면 메인 프로세스에서 렌더링).
+        force (bool): 캐시를 무시하고 모든 산출물을 다시 생성.
+        jobs (int): 플롯 렌더링 워커 프로세스 수 (None이면 CPU 수).
+    """
+    _init_notebook_plotting()
+    cache = ArtifactCache(RESULT_DIR)
+    data_files = (TRAIN_POWER_CSV, TRAIN_WEATHER_CSV)
+
+    eda_steps = [
+        ("pairplot", plot_pairplot, f'{RESULT_DIR}/pairplot.png'),
+        ("heatmap", plot_heatmap, f'{RESULT_DIR}/heatmap.png'),
+    ]
+    train_outputs = [f'{RESULT_DIR}/linear_regression_model.pkl',
+                     f'{RESULT_DIR}/svr_pipeline_model.pkl', TRAIN_RESULT_PATH]
+    train_key = cache.key(files=data_files, funcs=(load_data, evaluation, train_models),
+                          params={"features": FEATURES, "test_size": TEST_SIZE,
+                                  "random_state": RANDOM_STATE, "svr": SVR_PARAMS})
+    eval_steps = [
+        ("evaluation_metrics", plot_evaluation_metrics, f'{RESULT_DIR}/evaluation_metrics.png',
+         lambda r: (r["df_linear"], r["df_svr"])),
+        ("actual_vs_predicted", plot_actual_vs_predicted, f'{RESULT_DIR}/actual_vs_predicted.png',
+         lambda r: (r["y_test"], r["y_pred_lr"], r["y_pred_svr"])),
+    ]
+
+    stale_eda = []
+    for name, func, path in eda_steps:
+        key = cache.key(files=data_files, funcs=(load_data, func), params={"path": path})
+        if force or not cache.is_fresh(name, key, [path]):
+            stale_eda.append((name, func, path, key))
+        else:
+            print(f"[SKIP] {name} is up to date.")
+    train_stale = force or not cache.is_fresh("train", train_key, train_outputs)
+    stale_eval = []
+    for name, func, path, get_args in eval_steps:
+        key = cache.key(funcs=(func,), params={"path": path}, deps=(train_key,))
+        if force or train_stale or not cache.is_fresh(name, key, [path]):
+            stale_eval.append((name, func, path, get_args, key))
+        else:
+            print(f"[SKIP] {name} is up to date.")
+
+    if not (stale_eda or train_stale or stale_eval):
+        print("[DONE] All artifacts are up to date.")
+        return
+
+    comb_df = corr_df = None
+    if stale_eda or train_stale:
+        comb_df, corr_df = load_data()
+
+    # fork 방식에서는 워커가 학습 프로세스 전체를 복제하므로 렌더링할 플롯 수 이상 띄우지 않음
+    n_renders = len(stale_eda) + (0 if show else len(stale_eval))
+    pool = ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count(), n_renders)) if n_renders else None
+    try:
+        futures = {}
+        for name, func, path, key in stale_eda:
+            futures[pool.submit(_render, func, corr_df, path=path)] = (name, key, path)
+
+        if train_stale:
+            result = train_models(comb_df)
+            joblib.dump(result, TRAIN_RESULT_PATH)
+            cache.record("train", train_key, train_outputs)
+        elif stale_eval:
+            print("[SKIP] train is up to date; reusing cached predictions.")
+            result = joblib.load(TRAIN_RESULT_PATH)
+
+        for name, func, path, get_args, key in stale_eval:
+            if show:
+                func(*get_args(result), path=path, show=True)
+                cache.record(name, key, [path])
+                print(f"[OK] Rendered {path}.")
+            else:
+                futures[pool.submit(_render, func, *get_args(result), path=path, show=False)] = (name, key, path)
+
+        for future in as_completed(futures):
+            name, key, path = futures[future]
+            future.result()
+            cache.record(name, key, [path])
+            print(f"[OK] Rendered {path}.")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
+import os
 import pandas as pd
 
-def split_power_data_by_year(input_csv):
+def split_power_data_by_year(input_csv, output_dir="."):
     # 1) CSV 로드, StartDate 열을 datetime으로 파싱
     df = pd.read_csv(input_csv, parse_dates=["StartDate"])
     
@@ -11,14 +12,14 @@ def split_power_data_by_year(input_csv):
     df_test  = df[df["StartDate"] >= "2020-01-01"]
 
     # 3) 각각 저장
-    df_train.to_csv("./train/power.csv", index=False)
-    df_test.to_csv("./test/power.csv", index=False)
+    df_train.to_csv(os.path.join(output_dir, "train", "power.csv"), index=False)
+    df_test.to_csv(os.path.join(output_dir, "test", "power.csv"), index=False)
 
     print("Split power completed.")
     print(f"Train power dataset size: {len(df_train)}")
     print(f"Test power dataset size:  {len(df_test)}")
 
-def split_wether_data_by_year(input_csv):
+def split_wether_data_by_year(input_csv, output_dir="."):
     # 1) CSV 로드, StartDate 열을 datetime으로 파싱
     df = pd.read_csv(input_csv, parse_dates=["Date"])
     
@@ -29,8 +30,8 @@ def split_wether_data_by_year(input_csv):
     df_test  = df[df["Date"] >= "2020-01-01"]
 
     # 3) 각각 저장
-    df_train.to_csv("./train/wether.csv", index=False)
-    df_test.to_csv("./test/wether.csv", index=False)
+    df_train.to_csv(os.path.join(output_dir, "train", "wether.csv"), index=False)
+    df_test.to_csv(os.path.join(output_dir, "test", "wether.csv"), index=False)
 
     print("Split wether completed.")
     print(f"Train wether dataset size: {len(df_train)}")
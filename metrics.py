@@ -0,0 +1,316 @@
+# metrics.py
+
+import os
+import sys
+import time
+import bisect
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# 단계별 소요시간(초) 히스토그램 버킷 (Prometheus 기본값과 유사)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = "powertwin"
+
+# 프로파일러 토글: "" (끔) / "cprofile" / "sample"
+PROFILE_MODE = os.environ.get("POWERTWIN_PROFILE", "").strip().lower()
+PROFILE_DIR = os.environ.get("POWERTWIN_PROFILE_DIR", "./profiles")
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get("POWERTWIN_PROFILE_INTERVAL", "0.005"))
+
+# 설정 시 ingester가 이 포트에서 /metrics 를 노출 (예: 9108)
+METRICS_PORT = os.environ.get("POWERTWIN_METRICS_PORT", "").strip()
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        누적 버킷 방식의 히스토그램. 관측값 하나당 bisect 한 번과 덧셈만 수행합니다.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """
+        버킷 경계 기준으로 근사한 분위수를 반환합니다. (+Inf 버킷이면 관측 최대값)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        단계별 히스토그램과 카운터를 보관하는 스레드 안전 저장소.
+        키는 (metric 이름, 정렬된 label 튜플) 입니다.
+        """
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        with 블록의 실행 시간을 stage_seconds{stage=...} 히스토그램에 기록합니다.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render_prometheus(self):
+        """
+        Prometheus text exposition format (0.0.4) 문자열을 반환합니다.
+        """
+        with self._lock:
+            histograms = {k: (h.buckets, list(h.counts), h.count, h.sum)
+                          for k, h in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        typed = set()
+        for (name, labels), value in sorted(counters.items()):
+            full = f"{METRIC_PREFIX}_{name}"
+            if full not in typed:
+                lines.append(f"# TYPE {full} counter")
+                typed.add(full)
+            lines.append(f"{full}{_format_labels(labels)} {value}")
+
+        for (name, labels), (buckets, counts, count, total) in sorted(histograms.items()):
+            full = f"{METRIC_PREFIX}_{name}"
+            if full not in typed:
+                lines.append(f"# TYPE {full} histogram")
+                typed.add(full)
+            cumulative = 0
+            for bound, n in zip(buckets, counts):
+                cumulative += n
+                lines.append(f"{full}_bucket{_format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{full}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{full}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{full}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """
+        사람이 읽기 위한 요약 문자열 (단계별 count/mean/p50/p95/max, 카운터 값).
+        """
+        with self._lock:
+            rows = []
+            for (name, labels), h in sorted(self._histograms.items()):
+                label = ",".join(f"{k}={v}" for k, v in labels)
+                mean = h.sum / h.count if h.count else 0.0
+                rows.append(f"  {name}{{{label}}} n={h.count} mean={mean * 1000:.1f}ms "
+                            f"p50<={h.quantile(0.5) * 1000:.1f}ms p95<={h.quantile(0.95) * 1000:.1f}ms "
+                            f"max={h.max * 1000:.1f}ms")
+            for (name, labels), value in sorted(self._counters.items()):
+                label = ",".join(f"{k}={v}" for k, v in labels)
+                rows.append(f"  {name}{{{label}}} {value}")
+        return "\n".join(["[METRICS]"] + rows)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for k, v in labels:
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+# 프로세스 전역 레지스트리
+REGISTRY = MetricsRegistry()
+observe = REGISTRY.observe
+inc = REGISTRY.inc
+timer = REGISTRY.timer
+render_prometheus = REGISTRY.render_prometheus
+summary = REGISTRY.summary
+
+
+def start_http_server(port, host="0.0.0.0", registry=None):
+    """
+    별도 daemon 스레드에서 GET /metrics 에 Prometheus text format을 응답하는 서버를 띄웁니다.
+    Flask가 없는 프로세스(send_data.py 등)의 레지스트리를 scrape 하기 위한 용도입니다.
+
+    Returns:
+        http.server.ThreadingHTTPServer: shutdown()으로 종료할 수 있는 서버 객체.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or REGISTRY
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrape 요청마다 stderr에 로그를 남기지 않음
+
+    server = ThreadingHTTPServer((host, int(port)), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="powertwin-metrics-http", daemon=True).start()
+    print(f"[OK] Serving metrics on http://{host}:{server.server_address[1]}/metrics.")
+    return server
+
+
+def start_periodic_summary(interval, registry=None):
+    """
+    interval(초)마다 summary()를 출력하는 daemon 스레드를 시작합니다.
+    행 처리 간격과 무관하게 주기가 유지됩니다.
+
+    Returns:
+        threading.Event: set() 하면 스레드가 종료됩니다.
+    """
+    registry = registry or REGISTRY
+    stop = threading.Event()
+
+    def _run():
+        while not stop.wait(interval):
+            print(registry.summary(), flush=True)
+
+    threading.Thread(target=_run, name="powertwin-summary", daemon=True).start()
+    return stop
+
+
+def ditto_request(method, url, **kwargs):
+    """
+    requests.request를 감싸 Ditto 호출의 소요시간, 상태코드, 송수신 바이트를 기록합니다.
+    stage 이름은 ditto_<method> (예: ditto_get, ditto_put) 입니다.
+    """
+    import requests
+
+    start = time.perf_counter()
+    try:
+        resp = requests.request(method, url, **kwargs)
+    except requests.RequestException:
+        REGISTRY.inc("ditto_requests_total", method=method.upper(), status="error")
+        raise
+    finally:
+        REGISTRY.observe("stage_seconds", time.perf_counter() - start, stage=f"ditto_{method.lower()}")
+
+    body = resp.request.body if resp.request is not None else None
+    REGISTRY.inc("ditto_requests_total", method=method.upper(), status=str(resp.status_code))
+    REGISTRY.inc("ditto_bytes_sent_total", len(body) if body else 0)
+    REGISTRY.inc("ditto_bytes_received_total", len(resp.content or b""))
+    return resp
+
+
+class _SamplingProfiler:
+    def __init__(self, thread_id, interval):
+        """
+        대상 스레드의 스택을 주기적으로 샘플링하여 collapsed stack 형태로 집계합니다.
+        (flamegraph.pl / speedscope 에서 바로 읽을 수 있는 형식)
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="powertwin-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+@contextmanager
+def profiled(name, mode=None):
+    """
+    POWERTWIN_PROFILE 환경변수(또는 mode 인자)에 따라 with 블록을 프로파일링합니다.
+      - "cprofile": <PROFILE_DIR>/<name>.prof 저장 후 누적시간 상위 20개 출력
+      - "sample"  : <PROFILE_DIR>/<name>.folded 에 collapsed stack 저장
+      - 그 외     : 아무 것도 하지 않음 (오버헤드 없음)
+    """
+    mode = PROFILE_MODE if mode is None else mode
+    if mode not in ("cprofile", "sample"):
+        yield
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    if mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            path = os.path.join(PROFILE_DIR, f"{name}.prof")
+            profiler.dump_stats(path)
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+            print(f"[OK] cProfile stats saved to {path}.")
+    else:
+        sampler = _SamplingProfiler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL)
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            path = os.path.join(PROFILE_DIR, f"{name}.folded")
+            sampler.dump(path)
+            print(f"[OK] Sampled {sum(sampler.stacks.values())} stacks to {path}.")
@@ -0,0 +1,166 @@
+# powertwin.py
+"""
+PowerTwin 통합 CLI
+
+    python powertwin.py ingest    # Ditto로 실시간(주기) 전송
+    python powertwin.py backfill  # 대기 없이 과거 데이터 일괄 전송
+    python powertwin.py train     # EDA 이미지 생성 및 모델 학습
+    python powertwin.py serve     # Flask UI / API 실행
+    python powertwin.py predict 85 70 65 0.0
+    python powertwin.py split     # 원본 CSV를 train/test로 분리
+    python powertwin.py synth --devices 5000 --years 10  # 부하 테스트용 합성 데이터
+
+무거운 라이브러리(pandas, sklearn, flask, matplotlib ...)는 각 서브커맨드가
+실행될 때 LAZY_IMPORTS에 정의된 모듈만 import 합니다.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+# 서브커맨드별로 필요한 모듈 (tests/test_startup_budget.py도 이 목록을 사용)
+LAZY_IMPORTS = {
+    "ingest": ("send_data", "metrics"),
+    "backfill": ("send_data", "metrics"),
+    "train": ("data_visulaization_EDA",),
+    "serve": ("show_user",),
+    "predict": ("joblib", "sampling"),
+    "split": ("dataset.split_data",),
+    "synth": ("synthetic_data",),
+}
+
+LR_MODEL_PATH = "./static/result/linear_regression_model.pkl"
+SVR_MODEL_PATH = "./static/result/svr_pipeline_model.pkl"
+
+
+def _load(command):
+    """
+    서브커맨드에 필요한 모듈을 import 하여 LAZY_IMPORTS 순서대로 반환합니다.
+    """
+    return [importlib.import_module(name) for name in LAZY_IMPORTS[command]]
+
+
+def cmd_ingest(args):
+    send_data, metrics = _load("ingest")
+    with metrics.profiled("ingest"):
+        send_data.main(power_csv=args.power, weather_csv=args.weather,
+                       interval=args.interval, reset=not args.no_reset)
+
+
+def cmd_backfill(args):
+    send_data, metrics = _load("backfill")
+    with metrics.profiled("backfill"):
+        send_data.main(power_csv=args.power, weather_csv=args.weather,
+                       interval=args.interval, reset=args.reset,
+                       start=args.start, end=args.end)
+
+
+def cmd_train(args):
+    eda, = _load("train")
+    eda.main(show=not args.no_show, force=args.force, jobs=args.jobs)
+
+
+def cmd_serve(args):
+    show_user, = _load("serve")
+    show_user.app.run(debug=args.debug, host=args.host, port=args.port)
+
+
+def cmd_predict(args):
+    joblib, sampling = _load("predict")
+    lr_sampler = sampling.SklearnSampler(joblib.load(args.lr_model))
+    svr_sampler = sampling.SklearnSampler(joblib.load(args.svr_model))
+    print("Linear Regression Prediction:", lr_sampler.predict(args.features))
+    print("SVR Prediction:", svr_sampler.predict(args.features))
+
+
+def cmd_split(args):
+    split_data, = _load("split")
+    split_data.split_power_data_by_year(args.power, output_dir=args.output_dir)
+    split_data.split_wether_data_by_year(args.weather, output_dir=args.output_dir)
+
+
+def cmd_synth(args):
+    synthetic_data, = _load("synth")
+    for path in (args.power_out, args.weather_out):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    profile = synthetic_data.MeterProfile.fit(args.source_power, args.source_weather)
+    generator = synthetic_data.SyntheticMeterGenerator(
+        profile, n_devices=args.devices, start=args.start, years=args.years, seed=args.seed,
+        chunk_days=args.chunk_days, device_chunk=args.device_chunk)
+    if args.format == "npy":
+        generator.write_npy(args.power_out, args.weather_out)
+    else:
+        generator.write_csv(args.power_out, args.weather_out)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="powertwin", description="Ditto 기반 전력 디지털 트윈 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="power/weather 데이터를 주기적으로 Ditto에 전송")
+    p.add_argument("--power", default="./dataset/test/power.csv")
+    p.add_argument("--weather", default="./dataset/test/weather.csv")
+    p.add_argument("--interval", type=float, default=2, help="행 사이 전송 간격(초)")
+    p.add_argument("--no-reset", action="store_true", help="Ditto Thing을 초기화하지 않음")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("backfill", help="대기 없이 과거 데이터를 Ditto에 일괄 전송")
+    p.add_argument("--power", default="./dataset/test/power.csv")
+    p.add_argument("--weather", default="./dataset/test/weather.csv")
+    p.add_argument("--start", help="시작 날짜 (YYYY-MM-DD)")
+    p.add_argument("--end", help="종료 날짜 (YYYY-MM-DD, 포함)")
+    p.add_argument("--interval", type=float, default=0, help="행 사이 전송 간격(초)")
+    p.add_argument("--reset", action="store_true", help="전송 전에 Ditto Thing을 초기화")
+    p.set_defaults(func=cmd_backfill)
+
+    p = sub.add_parser("train", help="EDA 이미지 생성 및 LR/SVR 모델 학습")
+    p.add_argument("--no-show", action="store_true", help="plt.show() 창을 띄우지 않음")
+    p.add_argument("--force", action="store_true", help="캐시를 무시하고 모든 산출물 재생성")
+    p.add_argument("--jobs", type=int, help="플롯 렌더링 워커 프로세스 수")
+    p.set_defaults(func=cmd_train)
+
+    p = sub.add_parser("serve", help="Flask UI / API 서버 실행")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=8085)
+    p.add_argument("--debug", action="store_true")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("predict", help="저장된 모델로 일별 전력 사용량 예측")
+    p.add_argument("features", nargs=4, type=float,
+                   metavar=("TEMP_MAX", "TEMP_MIN", "DEW_MAX", "PRECIPIT"))
+    p.add_argument("--lr-model", default=LR_MODEL_PATH)
+    p.add_argument("--svr-model", default=SVR_MODEL_PATH)
+    p.set_defaults(func=cmd_predict)
+
+    p = sub.add_parser("split", help="원본 CSV를 2020년 기준 train/test로 분리")
+    p.add_argument("--power", default="./dataset/power_usage_2016_to_2020.csv")
+    p.add_argument("--weather", default="./dataset/weather_2016_2020_daily.csv")
+    p.add_argument("--output-dir", default="./dataset")
+    p.set_defaults(func=cmd_split)
+
+    p = sub.add_parser("synth", help="원본 데이터 패턴을 따르는 대규모 합성 전력/날씨 데이터 생성")
+    p.add_argument("--devices", type=int, default=1000)
+    p.add_argument("--years", type=int, default=5)
+    p.add_argument("--start", default="2021-01-01")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--format", choices=("csv", "npy"), default="csv",
+                   help="power 출력 형식 (npy: 시간x기기 float32 배열)")
+    p.add_argument("--power-out", default="./dataset/synthetic/power.csv")
+    p.add_argument("--weather-out", default="./dataset/synthetic/weather.csv")
+    p.add_argument("--chunk-days", type=int, default=7)
+    p.add_argument("--device-chunk", type=int, default=1000)
+    p.add_argument("--source-power", default="./dataset/power_usage_2016_to_2020.csv")
+    p.add_argument("--source-weather", default="./dataset/weather_2016_2020_daily.csv")
+    p.set_defaults(func=cmd_synth)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
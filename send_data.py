@@ -1,14 +1,12 @@
 # sand_data.py
 
 import time
-import requests
 import pandas as pd
 import numpy as np
-import torch
 import joblib
 from datetime import datetime
 from sampling import SklearnSampler
-import matplotlib.pyplot as plt
+import metrics
 import os
 
 # Ditto config
@@ -17,6 +15,7 @@ PASSWORD = "ditto"
 DITTO_BASE_URL = "http://localhost:8080/api/2"
 THING_ID = "mycompany:device01"
 FEATURE_PREFIX = "sensor_"  # 날짜별 Feature를 위한 접두사
+METRICS_SUMMARY_INTERVAL = 60  # 계측 요약 출력 주기 (초)
 
 POWER_CSV = "./dataset/test/power.csv"
 WEATHER_CSV = "./dataset/test/weather.csv"
@@ -28,14 +27,14 @@ def reset_ditto_thing():
     (정책은 "mycompany:device01"으로 연결되어 있다고 가정)
     """
     url = f"{DITTO_BASE_URL}/things/{THING_ID}"
-    resp = requests.delete(url, auth=(USERNAME, PASSWORD))
+    resp = metrics.ditto_request("DELETE", url, auth=(USERNAME, PASSWORD))
     if resp.ok:
         print(f"[OK] Deleted Thing {THING_ID} successfully.")
     else:
         print(f"[WARN] {resp.status_code} {resp.text} while deleting Thing {THING_ID}.")
 
     # Thing 생성
-    resp = requests.put(url, auth=(USERNAME, PASSWORD), json={"policyId": "mycompany:device01"})
+    resp = metrics.ditto_request("PUT", url, auth=(USERNAME, PASSWORD), json={"policyId": "mycompany:device01"})
     if resp.ok:
         print(f"[OK] Created Thing {THING_ID} successfully.")
     else:
@@ -48,7 +47,7 @@ def get_feature_properties(feature_id):
     존재하지 않을 경우 빈 dict를 반환합니다.
     """
     url = f"{DITTO_BASE_URL}/things/{THING_ID}/features/{feature_id}/properties"
-    resp = requests.get(url, auth=(USERNAME, PASSWORD))
+    resp = metrics.ditto_request("GET", url, auth=(USERNAME, PASSWORD))
     return resp.json() if resp.ok else {}
 
 
@@ -57,7 +56,7 @@ def put_feature_properties(feature_id, new_properties):
     특정 Feature의 properties를 PUT으로 저장합니다.
     """
     url = f"{DITTO_BASE_URL}/things/{THING_ID}/features/{feature_id}/properties"
-    resp = requests.put(url, auth=(USERNAME, PASSWORD), json=new_properties)
+    resp = metrics.ditto_request("PUT", url, auth=(USERNAME, PASSWORD), json=new_properties)
     if resp.ok:
         print(f"[OK] Updated properties for {feature_id} successfully.")
     else:
@@ -116,7 +115,7 @@ def ensure_feature_exists(feature_id):
     """
     if not get_feature_properties(feature_id):
         url = f"{DITTO_BASE_URL}/things/{THING_ID}/features/{feature_id}"
-        resp = requests.put(url, auth=(USERNAME, PASSWORD), json={"properties": {}})
+        resp = metrics.ditto_request("PUT", url, auth=(USERNAME, PASSWORD), json={"properties": {}})
         if resp.ok:
             print(f"[OK] Created feature {feature_id}.")
         else:
@@ -153,23 +152,41 @@ def run_model_analysis(date_data, lr_sampler, svr_sampler):
     svr_pred = date_data.get("svr_prediction")
 
     if lr_pred is None or svr_pred is None:
-        lr_pred = lr_sampler.predict(w_feats)
-        svr_pred = svr_sampler.predict(w_feats)
+        with metrics.timer("predict"):
+            lr_pred = lr_sampler.predict(w_feats)
+            svr_pred = svr_sampler.predict(w_feats)
         date_data["lr_prediction"] = lr_pred
         date_data["svr_prediction"] = svr_pred
 
     return lr_pred, svr_pred
 
 
-def main():
+def main(power_csv=POWER_CSV, weather_csv=WEATHER_CSV, interval=2, reset=True, start=None, end=None):
+    """
+    power/weather CSV를 한 행씩 Ditto로 전송하고 예측 결과를 갱신합니다.
+
+    Args:
+        power_csv (str): 전력 사용량 CSV 경로.
+        weather_csv (str): 일별 날씨 CSV 경로.
+        interval (float): 행 사이 전송 간격(초). 0이면 대기 없이 전송 (backfill).
+        reset (bool): 시작 전에 Ditto Thing을 삭제 후 재생성할지 여부.
+        start (str): 이 날짜(YYYY-MM-DD) 이후의 행만 전송.
+        end (str): 이 날짜(YYYY-MM-DD) 이전의 행만 전송 (해당 날짜 포함).
+    """
     # [A] Ditto 초기화
-    reset_ditto_thing()
+    if reset:
+        reset_ditto_thing()
 
     # [B] CSV 파일 로드 및 timestamp 변환
-    df_power = pd.read_csv(POWER_CSV)
-    df_weather = pd.read_csv(WEATHER_CSV)
-    df_power["timestamp"] = pd.to_datetime(df_power["StartDate"])
-    df_weather["timestamp"] = pd.to_datetime(df_weather["Date"])
+    with metrics.timer("csv_read"):
+        df_power = pd.read_csv(power_csv)
+        df_weather = pd.read_csv(weather_csv)
+        df_power["timestamp"] = pd.to_datetime(df_power["StartDate"])
+        df_weather["timestamp"] = pd.to_datetime(df_weather["Date"])
+    if start:
+        df_power = df_power[df_power["timestamp"] >= pd.Timestamp(start)]
+    if end:
+        df_power = df_power[df_power["timestamp"] < pd.Timestamp(end) + pd.Timedelta(days=1)]
 
     # [C] 저장된 모델 로드 및 Sampler 인스턴스 생성
     lr_model = joblib.load('./static/result/linear_regression_model.pkl')
@@ -178,59 +195,76 @@ def main():
     svr_sampler = SklearnSampler(svr_model)
 
     # [D] 일정 간격(테스트를 위해 interval=2초)으로 power 데이터를 순차 전송
-    interval = 2  # 실제 운영 시에는 600초(10분) 등 적절하게 설정
+    #     실제 운영 시에는 600초(10분) 등 적절하게 설정
     next_run = time.time()
-
-    for i, row in df_power.iterrows():
-        now = time.time()
-        if now < next_run:
-            time.sleep(next_run - now)
-        next_run += interval
-
-        # (1) 현재 row의 날짜와 feature_id 생성
-        date_str = row["timestamp"].strftime("%Y-%m-%d")
-        feature_id = f"{FEATURE_PREFIX}{date_str}"
-
-        # (2) 해당 날짜의 weather 정보 추출
-        w = df_weather[df_weather["timestamp"].dt.date == row["timestamp"].date()]
-        if not w.empty:
-            daily_data = extract_daily_weather(w.iloc[0])
-        else:
-            daily_data = {}
-
-        # (3) 시간 단위 데이터 구성
-        hourly_data = {
-            "timestamp": row["timestamp"].strftime("%H:%M:%S"),
-            "Value_kWh": float(row["Value (kWh)"]),
-            "day_of_week": float(row.get("day_of_week", 0.0))
-        }
-
-        # (4) Feature 존재 여부 확인 및 생성
-        ensure_feature_exists(feature_id)
-
-        # (5) Feature 업데이트: dailyData 갱신 및 hourlyData 추가
-        update_feature(feature_id, daily_data, hourly_data)
-        print(f"Sent row {i} at {time.strftime('%Y-%m-%d %H:%M:%S')} for {date_str}")
-
-        # (6) Ditto에 저장된 해당 날짜의 전체 data 가져오기
-        date_data = get_feature_data(feature_id)
-
-        # (7) 모델 분석 수행 (예측값이 없으면 예측 후 추가)
-        lr_prediction, svr_prediction = run_model_analysis(date_data, lr_sampler, svr_sampler)
-
-        # (8) 분석 결과를 dailyData에 추가하여 최종 업데이트
-        if date_data.get("dailyData"):
-            # dailyData가 dict이면 직접 key에 저장
-            date_data["dailyData"]["lr_prediction"] = float(lr_prediction)
-            date_data["dailyData"]["svr_prediction"] = float(svr_prediction)
-        else:
-            print(f"[WARN] dailyData is empty for {feature_id}!")
-
-        put_feature_properties(feature_id, date_data)
-        print(f"[OK] Updated analysis result for {date_str}.")
+    stop_summary = metrics.start_periodic_summary(METRICS_SUMMARY_INTERVAL)
+    metrics_server = metrics.start_http_server(metrics.METRICS_PORT) if metrics.METRICS_PORT else None
+
+    # 행 처리 중 예외(Ditto 장애 등)가 나도 요약 스레드와 metrics 서버는 정리
+    try:
+        for i, row in df_power.iterrows():
+            now = time.time()
+            if now < next_run:
+                time.sleep(next_run - now)
+            next_run += interval
+            row_start = time.perf_counter()
+
+            # (1) 현재 row의 날짜와 feature_id 생성
+            date_str = row["timestamp"].strftime("%Y-%m-%d")
+            feature_id = f"{FEATURE_PREFIX}{date_str}"
+
+            # (2) 해당 날짜의 weather 정보 추출
+            with metrics.timer("weather_lookup"):
+                w = df_weather[df_weather["timestamp"].dt.date == row["timestamp"].date()]
+                if not w.empty:
+                    daily_data = extract_daily_weather(w.iloc[0])
+                else:
+                    daily_data = {}
+
+            # (3) 시간 단위 데이터 구성
+            hourly_data = {
+                "timestamp": row["timestamp"].strftime("%H:%M:%S"),
+                "Value_kWh": float(row["Value (kWh)"]),
+                "day_of_week": float(row.get("day_of_week", 0.0))
+            }
+
+            # (4) Feature 존재 여부 확인 및 생성
+            with metrics.timer("feature_ensure"):
+                ensure_feature_exists(feature_id)
+
+            # (5) Feature 업데이트: dailyData 갱신 및 hourlyData 추가
+            update_feature(feature_id, daily_data, hourly_data)
+            print(f"Sent row {i} at {time.strftime('%Y-%m-%d %H:%M:%S')} for {date_str}")
+
+            # (6) Ditto에 저장된 해당 날짜의 전체 data 가져오기
+            date_data = get_feature_data(feature_id)
+
+            # (7) 모델 분석 수행 (예측값이 없으면 예측 후 추가)
+            lr_prediction, svr_prediction = run_model_analysis(date_data, lr_sampler, svr_sampler)
+
+            # (8) 분석 결과를 dailyData에 추가하여 최종 업데이트
+            if date_data.get("dailyData"):
+                # dailyData가 dict이면 직접 key에 저장
+                date_data["dailyData"]["lr_prediction"] = float(lr_prediction)
+                date_data["dailyData"]["svr_prediction"] = float(svr_prediction)
+            else:
+                print(f"[WARN] dailyData is empty for {feature_id}!")
+
+            put_feature_properties(feature_id, date_data)
+            print(f"[OK] Updated analysis result for {date_str}.")
+
+            # (9) 행 단위 end-to-end 시간 기록 및 주기적 요약 출력
+            metrics.observe("stage_seconds", time.perf_counter() - row_start, stage="row_total")
+            metrics.inc("rows_total")
+    finally:
+        stop_summary.set()
+        if metrics_server is not None:
+            metrics_server.shutdown()
 
     print("[DONE] All rows sent and analyzed.")
+    print(metrics.summary())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with metrics.profiled("send_data"):
+        main()
\ No newline at end of file
@@ -1,8 +1,12 @@
 # show_user.py
 
-from flask import Flask, jsonify, render_template_string, url_for
-import requests
+from flask import Flask, Response, abort, g, jsonify, render_template_string, request, send_from_directory, url_for
+import os
 import re
+from functools import partial
+import time
+import metrics
+from artifact_cache import output_versions
 
 # Ditto config
 USERNAME = "ditto"
@@ -10,14 +14,35 @@ PASSWORD = "ditto"
 DITTO_BASE_URL = "http://localhost:8080/api/2"
 THING_ID = "mycompany:device01"
 
+RESULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "result")
+RESULT_MAX_AGE = 365 * 24 * 3600  # 버전(?v=) 이 붙은 분석 이미지는 1년간 캐시
+
 app = Flask(__name__)
 
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _record_request(response):
+    """
+    Flask 요청별 처리 시간과 상태코드를 기록합니다. (/metrics 자체는 제외)
+    """
+    if request.endpoint != "metrics_endpoint" and "request_start" in g:
+        endpoint = request.endpoint or "unknown"
+        metrics.observe("stage_seconds", time.perf_counter() - g.request_start, stage=f"http_{endpoint}")
+        metrics.inc("http_requests_total", endpoint=endpoint, status=str(response.status_code))
+    return response
+
+
 def get_ditto_features():
     """
     Ditto에 저장된 모든 Features 목록을 가져옵니다.
     """
     url = f"{DITTO_BASE_URL}/things/{THING_ID}/features"
-    resp = requests.get(url, auth=(USERNAME, PASSWORD))
+    resp = metrics.ditto_request("GET", url, auth=(USERNAME, PASSWORD))
     if resp.ok:
         return resp.json()
     return {}
@@ -50,7 +75,7 @@ def api_date(date_str):
     """
     feature_id = f"sensor_{date_str}"
     url = f"{DITTO_BASE_URL}/things/{THING_ID}/features/{feature_id}/properties"
-    resp = requests.get(url, auth=(USERNAME, PASSWORD))
+    resp = metrics.ditto_request("GET", url, auth=(USERNAME, PASSWORD))
     if resp.ok:
         data = resp.json()
         return jsonify({
@@ -59,6 +84,44 @@ def api_date(date_str):
         })
     return jsonify({"error": "Data not found"}), 404
 
+def result_url(filename, versions):
+    """
+    분석 이미지 URL. artifact manifest의 내용 해시(없거나 파일이 바뀌었으면 mtime)를 ?v= 로 붙여
+    이미지가 다시 생성될 때만 브라우저 캐시가 무효화되도록 합니다.
+
+    Args:
+        filename (str): static/result 안의 이미지 파일명.
+        versions (dict): output_versions(RESULT_DIR) 결과 (요청당 한 번만 읽음).
+    """
+    version = versions.get(filename)
+    if version is None:
+        try:
+            version = str(int(os.path.getmtime(os.path.join(RESULT_DIR, filename))))
+        except OSError:
+            version = None
+    return url_for("result_image", filename=filename, v=version)
+
+@app.route("/result/<path:filename>")
+def result_image(filename):
+    """
+    static/result 의 분석 이미지(.png)를 장기 캐시 헤더와 함께 반환합니다.
+    """
+    if not filename.endswith(".png"):
+        abort(404)
+    versioned = "v" in request.args
+    response = send_from_directory(RESULT_DIR, filename, max_age=RESULT_MAX_AGE if versioned else None)
+    if versioned:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+    return response
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """
+    Prometheus text format으로 단계별 소요시간 히스토그램과 Ditto 요청 카운터를 노출합니다.
+    """
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
 @app.route("/")
 def index():
     """
@@ -105,25 +168,25 @@ def index():
       
       <div class="image-container">
         <h3>Pair Plot</h3>
-        <img src="{{ url_for('static', filename='result/pairplot.png') }}" alt="Pair Plot">
+        <img src="{{ result_url('pairplot.png') }}" alt="Pair Plot">
         <p class="caption">각 변수 간 분포와 산점도가 표시된 Pair Plot입니다.</p>
       </div>
 
       <div class="image-container">
         <h3>Heatmap</h3>
-        <img src="{{ url_for('static', filename='result/heatmap.png') }}" alt="Heatmap">
+        <img src="{{ result_url('heatmap.png') }}" alt="Heatmap">
         <p class="caption">수치형 변수 간 상관계수를 시각화한 Heatmap입니다.</p>
       </div>
 
       <div class="image-container">
         <h3>Evaluation Metrics</h3>
-        <img src="{{ url_for('static', filename='result/evaluation_metrics.png') }}" alt="Evaluation Metrics">
+        <img src="{{ result_url('evaluation_metrics.png') }}" alt="Evaluation Metrics">
         <p class="caption">모델 평가 지표 (MSE, MAE, R² 등)를 비교한 바 차트입니다.</p>
       </div>
 
       <div class="image-container">
         <h3>Actual vs Predicted</h3>
-        <img src="{{ url_for('static', filename='result/actual_vs_predicted.png') }}" alt="Actual vs Predicted">
+        <img src="{{ result_url('actual_vs_predicted.png') }}" alt="Actual vs Predicted">
         <p class="caption">실제 전력 사용량과 예측값의 산점도를 보여주는 그래프입니다.</p>
       </div>
     </div>
@@ -235,7 +298,8 @@ def index():
 </body>
 </html>
     """.strip()
-    return render_template_string(html_content)
+    versions = output_versions(RESULT_DIR)
+    return render_template_string(html_content, result_url=partial(result_url, versions=versions))
 
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=8085)
\ No newline at end of file
@@ -0,0 +1,259 @@
+# synthetic_data.py
+"""
+기존 단일 가구 데이터(power_usage_2016_to_2020.csv, weather_2016_2020_daily.csv)에서
+요일x시간 사용 패턴과 기온 반응, 날씨의 계절성을 추정한 뒤,
+수천 대 기기 x 수년치 시간별 전력 데이터를 청크 단위로 생성합니다.
+
+메모리는 (chunk_days * 24) x device_chunk 크기 배열만 사용하므로 전체 규모와 무관하게 일정합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+POWER_CSV = "./dataset/power_usage_2016_to_2020.csv"
+WEATHER_CSV = "./dataset/weather_2016_2020_daily.csv"
+# 원본 CSV의 날짜 표기가 일관되지 않아 data_visulaization_EDA.py와 같이 행 순서 기준으로 날짜를 부여
+SOURCE_START = "2016-06-01"
+
+WEATHER_COLUMNS = ["Temp_max", "Temp_avg", "Temp_min", "Dew_max", "Dew_avg", "Dew_min",
+                   "Hum_max", "Hum_avg", "Hum_min", "Wind_max", "Wind_avg", "Wind_min",
+                   "Press_max", "Press_avg", "Press_min", "Precipit"]
+# 같은 그룹 안에서는 max >= avg >= min 이 되도록 정렬
+_ORDERED_GROUPS = [("Temp_max", "Temp_avg", "Temp_min"), ("Dew_max", "Dew_avg", "Dew_min"),
+                   ("Hum_max", "Hum_avg", "Hum_min"), ("Wind_max", "Wind_avg", "Wind_min"),
+                   ("Press_max", "Press_avg", "Press_min")]
+_NON_NEGATIVE = ["Wind_max", "Wind_avg", "Wind_min", "Precipit"]
+
+
+def _harmonics(day_of_year):
+    """
+    연 주기 1, 2차 조화항 설계 행렬 [1, sin, cos, sin2, cos2].
+    """
+    w = 2 * np.pi * np.asarray(day_of_year, dtype=float) / 365.25
+    return np.column_stack([np.ones_like(w), np.sin(w), np.cos(w), np.sin(2 * w), np.cos(2 * w)])
+
+
+class MeterProfile:
+    def __init__(self, hourly_mean, hourly_cv, temp_coef, temp_ref,
+                 weather_coef, weather_resid_std, weather_corr_factor, weather_phi, dry_day_frac):
+        """
+        Args:
+            hourly_mean (np.ndarray): (7, 24) 요일x시간 평균 kWh.
+            hourly_cv (np.ndarray): (7, 24) 요일x시간 변동계수 (std / mean).
+            temp_coef (np.ndarray): 일 사용량 = polyval(temp_coef, Temp_avg) 2차 다항식 계수.
+            temp_ref (float): temp_coef 기준 평균 일 사용량 (기온 반응 배율의 분모).
+            weather_coef (np.ndarray): (5, len(WEATHER_COLUMNS)) 날씨 계절성 조화항 계수.
+            weather_resid_std (np.ndarray): 날씨 잔차의 컬럼별 표준편차.
+            weather_corr_factor (np.ndarray): 잔차 상관행렬 R에 대해 F @ F.T ≈ R 인 행렬.
+            weather_phi (np.ndarray): 날씨 잔차의 컬럼별 lag-1 자기상관.
+            dry_day_frac (float): 강수량(Precipit)이 0인 날의 비율.
+        """
+        self.hourly_mean = hourly_mean
+        self.hourly_cv = hourly_cv
+        self.temp_coef = temp_coef
+        self.temp_ref = temp_ref
+        self.weather_coef = weather_coef
+        self.weather_resid_std = weather_resid_std
+        self.weather_corr_factor = weather_corr_factor
+        self.weather_phi = weather_phi
+        self.dry_day_frac = dry_day_frac
+
+    @classmethod
+    def fit(cls, power_csv=POWER_CSV, weather_csv=WEATHER_CSV):
+        """
+        원본 CSV에서 프로파일을 추정합니다. (모두 벡터 연산)
+        """
+        df_power = pd.read_csv(power_csv)
+        df_weather = pd.read_csv(weather_csv)
+
+        # (1) 요일 x 시간 평균 / 변동계수
+        hour = df_power["StartDate"].str[11:13].astype(int).to_numpy()
+        dow = df_power["day_of_week"].to_numpy().astype(int) % 7
+        kwh = df_power["Value (kWh)"].to_numpy(dtype=float)
+        idx = dow * 24 + hour
+        count = np.bincount(idx, minlength=7 * 24)
+        total = np.bincount(idx, weights=kwh, minlength=7 * 24)
+        sq = np.bincount(idx, weights=kwh ** 2, minlength=7 * 24)
+        mean = total / np.maximum(count, 1)
+        std = np.sqrt(np.maximum(sq / np.maximum(count, 1) - mean ** 2, 0.0))
+        hourly_mean = mean.reshape(7, 24)
+        hourly_cv = (std / np.where(mean > 0, mean, 1.0)).reshape(7, 24)
+
+        # (2) 일 사용량의 기온 반응 (행 순서 기준으로 weather와 정렬)
+        n_days = min(len(kwh) // 24, len(df_weather))
+        daily_kwh = kwh[:n_days * 24].reshape(n_days, 24).sum(axis=1)
+        temp_avg = df_weather["Temp_avg"].to_numpy(dtype=float)[:n_days]
+        temp_coef = np.polyfit(temp_avg, daily_kwh, 2)
+        temp_ref = float(np.polyval(temp_coef, temp_avg).mean())
+
+        # (3) 날씨 계절성 (조화항 최소제곱) + 잔차의 공분산 / 자기상관
+        day_of_year = pd.period_range(SOURCE_START, freq="D", periods=len(df_weather)).dayofyear
+        X = _harmonics(day_of_year)
+        Y = df_weather[WEATHER_COLUMNS].to_numpy(dtype=float)
+        weather_coef, *_ = np.linalg.lstsq(X, Y, rcond=None)
+        resid = Y - X @ weather_coef
+        resid_std = resid.std(axis=0)
+        safe_std = np.where(resid_std > 0, resid_std, 1.0)
+        z = resid / safe_std
+        weather_phi = np.clip((z[1:] * z[:-1]).mean(axis=0), 0.0, 0.99)
+        # 상관행렬이 수치적으로 양의 정부호가 아닐 수 있어 고유값을 0 이상으로 잘라 분해
+        eigval, eigvec = np.linalg.eigh(z.T @ z / len(z))
+        weather_corr_factor = eigvec * np.sqrt(np.clip(eigval, 0.0, None))
+
+        return cls(hourly_mean, hourly_cv, temp_coef, temp_ref,
+                   weather_coef, resid_std, weather_corr_factor, weather_phi,
+                   float((df_weather["Precipit"] == 0).mean()))
+
+    def temperature_factor(self, temp_avg):
+        """
+        Temp_avg에 대한 일 사용량 배율 (평균 기온 반응 = 1.0).
+        """
+        return np.maximum(np.polyval(self.temp_coef, temp_avg) / self.temp_ref, 0.05)
+
+
+class SyntheticMeterGenerator:
+    def __init__(self, profile, n_devices=1000, start="2021-01-01", years=5, seed=0,
+                 chunk_days=7, device_chunk=1000, scale_sigma=0.35, sensitivity_sigma=0.2):
+        """
+        Args:
+            profile (MeterProfile): MeterProfile.fit()으로 추정한 프로파일.
+            n_devices (int): 생성할 기기 수.
+            start (str): 시작 날짜 (YYYY-MM-DD).
+            years (int): 생성 기간(년).
+            seed (int): 난수 시드. 같은 시드와 청크 크기면 같은 결과를 냅니다.
+            chunk_days (int): 한 번에 생성할 일 수.
+            device_chunk (int): 한 번에 생성할 기기 수.
+            scale_sigma (float): 기기별 사용량 배율(lognormal)의 sigma.
+            sensitivity_sigma (float): 기기별 기온 민감도의 표준편차.
+        """
+        self.profile = profile
+        self.n_devices = n_devices
+        self.seed = seed
+        self.chunk_days = chunk_days
+        self.device_chunk = device_chunk
+        self.dates = pd.date_range(start, pd.Timestamp(start) + pd.DateOffset(years=years),
+                                   freq="D", inclusive="left")
+
+        rng = np.random.default_rng([seed, 0])
+        self.device_ids = np.array([f"device{i:05d}" for i in range(n_devices)])
+        # 평균 1이 되도록 보정한 lognormal 배율
+        self.device_scale = rng.lognormal(-scale_sigma ** 2 / 2, scale_sigma, n_devices)
+        self.device_sensitivity = np.maximum(rng.normal(1.0, sensitivity_sigma, n_devices), 0.0)
+        self._weather = None
+
+    @property
+    def n_hours(self):
+        return len(self.dates) * 24
+
+    def weather(self):
+        """
+        모든 기기가 공유하는 일별 날씨 DataFrame (weather_2016_2020_daily.csv 와 같은 컬럼).
+        """
+        if self._weather is not None:
+            return self._weather
+
+        p = self.profile
+        rng = np.random.default_rng([self.seed, 1])
+        base = _harmonics(self.dates.dayofyear) @ p.weather_coef
+        # 상관된 표준정규 혁신항 -> 컬럼별 AR(1) (정상분산 1 유지)
+        innov = rng.standard_normal((len(self.dates), len(WEATHER_COLUMNS))) @ p.weather_corr_factor.T
+        innov *= np.sqrt(1 - p.weather_phi ** 2)
+        z = np.empty_like(innov)
+        z[0] = innov[0] / np.sqrt(1 - p.weather_phi ** 2)
+        for t in range(1, len(innov)):  # 일 단위 루프: 수만 번 이하의 작은 벡터 연산
+            z[t] = p.weather_phi * z[t - 1] + innov[t]
+
+        df = pd.DataFrame(base + z * p.weather_resid_std, columns=WEATHER_COLUMNS)
+        for group in _ORDERED_GROUPS:
+            df[list(group)] = -np.sort(-df[list(group)].to_numpy(), axis=1)
+        # 맑은 날 비율이 원본과 같도록 하위 dry_day_frac 분위를 0으로 내림
+        precip = df["Precipit"].to_numpy()
+        df["Precipit"] = precip - np.quantile(precip, p.dry_day_frac)
+        df[_NON_NEGATIVE] = df[_NON_NEGATIVE].clip(lower=0.0)
+        df[["Hum_max", "Hum_avg", "Hum_min"]] = df[["Hum_max", "Hum_avg", "Hum_min"]].clip(0.0, 100.0)
+        df = df.round(2)
+
+        df.insert(0, "Date", self.dates.strftime("%Y-%m-%d"))
+        df.insert(1, "Day", self.dates.day)
+        df["day_of_week"] = self.dates.dayofweek
+        self._weather = df
+        return df
+
+    def iter_power_arrays(self):
+        """
+        (hour_offset, device_offset, values) 를 생성합니다.
+        values는 (chunk_days * 24, device_chunk) float32 배열이며 시간 우선 순서입니다.
+        """
+        p = self.profile
+        temp_factor = p.temperature_factor(self.weather()["Temp_avg"].to_numpy())
+        dow = self.dates.dayofweek.to_numpy()
+        sigma = np.sqrt(np.log1p(p.hourly_cv ** 2))  # lognormal 잡음 (평균 보존)
+
+        for d0 in range(0, len(self.dates), self.chunk_days):
+            d1 = min(d0 + self.chunk_days, len(self.dates))
+            hour_dow = np.repeat(dow[d0:d1], 24)
+            hour_of_day = np.tile(np.arange(24), d1 - d0)
+            mean = p.hourly_mean[hour_dow, hour_of_day][:, None]
+            sig = sigma[hour_dow, hour_of_day][:, None]
+            tf = np.repeat(temp_factor[d0:d1], 24)[:, None]
+
+            for k0 in range(0, self.n_devices, self.device_chunk):
+                k1 = min(k0 + self.device_chunk, self.n_devices)
+                rng = np.random.default_rng([self.seed, 2, d0, k0])
+                factor = 1 + self.device_sensitivity[k0:k1] * (tf - 1)
+                noise = np.exp(sig * rng.standard_normal((len(hour_dow), k1 - k0)) - sig ** 2 / 2)
+                values = self.device_scale[k0:k1] * mean * np.maximum(factor, 0.05) * noise
+                yield d0 * 24, k0, values.astype(np.float32)
+
+    def iter_power_chunks(self):
+        """
+        power_usage_2016_to_2020.csv 와 같은 컬럼(+ device_id)의 DataFrame 청크를 생성합니다.
+        """
+        hours = self.dates[0] + pd.to_timedelta(np.arange(self.n_hours), unit="h")
+        stamps = hours.strftime("%Y-%m-%d %H:%M:%S").to_numpy()
+        dow = hours.dayofweek.to_numpy()
+        notes = np.where(dow >= 5, "weekend", "weekday")
+
+        for h0, k0, values in self.iter_power_arrays():
+            n_hours, n_dev = values.shape
+            sl = slice(h0, h0 + n_hours)
+            yield pd.DataFrame({
+                "device_id": np.tile(self.device_ids[k0:k0 + n_dev], n_hours),
+                "StartDate": np.repeat(stamps[sl], n_dev),
+                "Value (kWh)": values.ravel(),
+                "day_of_week": np.repeat(dow[sl], n_dev),
+                "notes": np.repeat(notes[sl], n_dev),
+            })
+
+    def write_csv(self, power_path, weather_path):
+        """
+        power / weather 를 CSV로 저장합니다. power는 청크 단위로 이어 씁니다.
+        """
+        self.weather().to_csv(weather_path, index=False)
+        rows = 0
+        with open(power_path, "w", newline="") as f:
+            for i, chunk in enumerate(self.iter_power_chunks()):
+                chunk.to_csv(f, header=(i == 0), index=False, float_format="%.3f")
+                rows += len(chunk)
+        print(f"[OK] Wrote {rows} rows for {self.n_devices} devices to {power_path}.")
+
+    def write_npy(self, power_path, weather_path):
+        """
+        power를 (시간, 기기) float32 .npy 로 저장합니다. (np.load(..., mmap_mode="r") 로 읽기)
+        시간 축은 start 00:00 부터 1시간 간격, 기기 축은 device00000 부터 순서대로입니다.
+        """
+        self.weather().to_csv(weather_path, index=False)
+        # memmap 으로 쓰면 dirty page가 RSS에 누적되므로, 헤더를 쓴 뒤 일 청크 단위로 순차 기록
+        buffer = np.empty((self.chunk_days * 24, self.n_devices), dtype=np.float32)
+        with open(power_path, "wb") as f:
+            np.lib.format.write_array_header_1_0(f, {
+                "descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+                "fortran_order": False,
+                "shape": (self.n_hours, self.n_devices),
+            })
+            for h0, k0, values in self.iter_power_arrays():
+                n_rows, n_dev = values.shape
+                buffer[:n_rows, k0:k0 + n_dev] = values
+                if k0 + n_dev == self.n_devices:  # 해당 일 청크의 모든 기기를 채움
+                    f.write(buffer[:n_rows].data)
+        print(f"[OK] Wrote {self.n_hours}x{self.n_devices} array to {power_path}.")
@@ -0,0 +1,102 @@
+# test_artifact_cache.py
+
+import os
+
+import pytest
+
+from artifact_cache import ArtifactCache, output_versions
+
+
+def build_plot(path):
+    return path
+
+
+def build_plot_v2(path):
+    return path, "changed"
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    data = tmp_path / "data.csv"
+    data.write_text("a,b\n1,2\n")
+    result_dir = tmp_path / "result"
+    result_dir.mkdir()
+    return data, result_dir
+
+
+def test_key_changes_with_inputs_code_and_params(workspace):
+    data, result_dir = workspace
+    base = ArtifactCache(str(result_dir)).key(files=[str(data)], funcs=(build_plot,), params={"c": 1})
+
+    assert ArtifactCache(str(result_dir)).key(files=[str(data)], funcs=(build_plot,), params={"c": 1}) == base
+    assert ArtifactCache(str(result_dir)).key(files=[str(data)], funcs=(build_plot_v2,), params={"c": 1}) != base
+    assert ArtifactCache(str(result_dir)).key(files=[str(data)], funcs=(build_plot,), params={"c": 2}) != base
+    assert ArtifactCache(str(result_dir)).key(files=[str(data)], funcs=(build_plot,), params={"c": 1},
+                                              deps=("other",)) != base
+
+    data.write_text("a,b\n1,3\n")
+    assert ArtifactCache(str(result_dir)).key(files=[str(data)], funcs=(build_plot,), params={"c": 1}) != base
+
+
+def test_recorded_output_is_fresh_across_instances(workspace):
+    data, result_dir = workspace
+    output = str(result_dir / "plot.png")
+    with open(output, "wb") as f:
+        f.write(b"png-v1")
+
+    cache = ArtifactCache(str(result_dir))
+    key = cache.key(files=[str(data)], funcs=(build_plot,))
+    assert not cache.is_fresh("plot", key, [output])
+    cache.record("plot", key, [output])
+
+    reloaded = ArtifactCache(str(result_dir))
+    assert reloaded.is_fresh("plot", key, [output])
+    assert not reloaded.is_fresh("plot", "other-key", [output])
+
+
+def test_output_replaced_behind_cache_is_stale(workspace):
+    data, result_dir = workspace
+    output = str(result_dir / "plot.png")
+    with open(output, "wb") as f:
+        f.write(b"png-v1")
+    cache = ArtifactCache(str(result_dir))
+    key = cache.key(files=[str(data)])
+    cache.record("plot", key, [output])
+    version = output_versions(str(result_dir))["plot.png"]
+
+    # git checkout 처럼 같은 크기의 다른 내용으로 교체
+    with open(output, "wb") as f:
+        f.write(b"png-v2")
+    st = os.stat(output)
+    os.utime(output, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert not ArtifactCache(str(result_dir)).is_fresh("plot", key, [output])
+    assert output_versions(str(result_dir)).get("plot.png") != version
+
+
+def test_output_touched_with_same_content_stays_fresh(workspace):
+    data, result_dir = workspace
+    output = str(result_dir / "plot.png")
+    with open(output, "wb") as f:
+        f.write(b"png-v1")
+    cache = ArtifactCache(str(result_dir))
+    key = cache.key(files=[str(data)])
+    cache.record("plot", key, [output])
+
+    st = os.stat(output)
+    os.utime(output, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert ArtifactCache(str(result_dir)).is_fresh("plot", key, [output])
+
+
+def test_missing_output_is_stale(workspace):
+    data, result_dir = workspace
+    output = str(result_dir / "plot.png")
+    with open(output, "wb") as f:
+        f.write(b"png-v1")
+    cache = ArtifactCache(str(result_dir))
+    key = cache.key(files=[str(data)])
+    cache.record("plot", key, [output])
+
+    os.remove(output)
+    assert not ArtifactCache(str(result_dir)).is_fresh("plot", key, [output])
+    assert "plot.png" not in output_versions(str(result_dir))
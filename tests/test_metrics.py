@@ -0,0 +1,75 @@
+# test_metrics.py
+
+import re
+
+import pytest
+
+import metrics
+from metrics import Histogram, MetricsRegistry, _format_labels
+
+
+def _bucket_lines(text, name, stage):
+    pattern = re.compile(rf'^{name}_bucket\{{stage="{stage}",le="([^"]+)"\}} (\d+)$', re.M)
+    return [(le, int(n)) for le, n in pattern.findall(text)]
+
+
+def test_histogram_buckets_are_cumulative_and_end_with_count():
+    registry = MetricsRegistry()
+    for value in (0.0005, 0.003, 0.003, 0.2, 7.0, 42.0):
+        registry.observe("stage_seconds", value, stage="row_total")
+    text = registry.render_prometheus()
+
+    buckets = _bucket_lines(text, "powertwin_stage_seconds", "row_total")
+    counts = [n for _, n in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1][0] == "+Inf"
+    count = re.search(r'^powertwin_stage_seconds_count\{stage="row_total"\} (\d+)$', text, re.M)
+    assert buckets[-1][1] == int(count.group(1)) == 6
+
+
+def test_one_type_line_per_family():
+    registry = MetricsRegistry()
+    registry.observe("stage_seconds", 0.01, stage="a")
+    registry.observe("stage_seconds", 0.02, stage="b")
+    registry.inc("ditto_requests_total", method="GET", status="200")
+    registry.inc("ditto_requests_total", method="PUT", status="204")
+    text = registry.render_prometheus()
+
+    assert text.count("# TYPE powertwin_stage_seconds histogram") == 1
+    assert text.count("# TYPE powertwin_ditto_requests_total counter") == 1
+
+
+def test_format_labels_escapes_special_characters():
+    labels = (("path", 'C:\\tmp\n"x"'),)
+    assert _format_labels(labels) == '{path="C:\\\\tmp\\n\\"x\\""}'
+    assert _format_labels(()) == ""
+
+
+def test_quantile_empty_and_overflow():
+    hist = Histogram(buckets=(0.1, 1.0))
+    assert hist.quantile(0.5) == 0.0
+
+    hist.observe(0.05)
+    hist.observe(30.0)
+    assert hist.quantile(0.5) == 0.1
+    # +Inf 버킷에 떨어지면 버킷 경계 대신 관측 최대값
+    assert hist.quantile(0.99) == 30.0
+
+
+def test_ditto_request_records_error_and_stage_time(monkeypatch):
+    requests = pytest.importorskip("requests")
+
+    def raiser(method, url, **kwargs):
+        raise requests.ConnectionError("ditto down")
+
+    monkeypatch.setattr(requests, "request", raiser)
+    metrics.REGISTRY.reset()
+    try:
+        with pytest.raises(requests.ConnectionError):
+            metrics.ditto_request("put", "http://localhost:8080/api/2/things/x")
+        text = metrics.render_prometheus()
+    finally:
+        metrics.REGISTRY.reset()
+
+    assert 'powertwin_ditto_requests_total{method="PUT",status="error"} 1' in text
+    assert 'powertwin_stage_seconds_count{stage="ditto_put"} 1' in text
@@ -0,0 +1,85 @@
+# test_startup_budget.py
+"""
+powertwin.py 서브커맨드별 cold-start 검사.
+
+각 서브커맨드마다 새 인터프리터에서 powertwin._load(cmd)만 실행한 뒤
+  (1) 무거운 시각화/딥러닝 모듈이 import 되지 않았는지 확인하고
+  (2) 인터프리터 기동을 포함한 소요시간과 최대 RSS가 예산 이내인지 확인합니다.
+예산은 머신 편차를 고려해 느슨하게 잡은 보조 검사입니다.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from powertwin import LAZY_IMPORTS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 설치되지 않았을 때만 skip 하는 외부 의존성. 그 밖의 ModuleNotFoundError
+# (예: LAZY_IMPORTS 의 저장소 모듈 이름 오타)는 실패로 처리합니다.
+THIRD_PARTY = {"pandas", "numpy", "sklearn", "scipy", "joblib", "flask", "requests"}
+
+# 어떤 서브커맨드도 시작 시점에 불러오면 안 되는 모듈
+FORBIDDEN_MODULES = ("matplotlib", "seaborn", "plotly", "torch")
+
+# 서브커맨드별 예산: (초, MB)
+BUDGETS = {
+    "ingest": (5.0, 300),
+    "backfill": (5.0, 300),
+    "train": (10.0, 500),
+    "serve": (4.0, 200),
+    "predict": (4.0, 250),
+    "split": (5.0, 250),
+    "synth": (5.0, 250),
+}
+
+_CHILD = """
+import json, resource, sys
+import powertwin
+try:
+    powertwin._load(sys.argv[1])
+except ModuleNotFoundError as e:
+    print(json.dumps({"missing": e.name}))
+    sys.exit(0)
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    # Linux는 KB, macOS는 byte 단위
+    "rss_mb": rss / (1024 * 1024 if sys.platform == "darwin" else 1024),
+    "modules": sorted({name.split(".")[0] for name in sys.modules}),
+}))
+"""
+
+
+def _run_child(command):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _CHILD, command], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    elapsed = time.perf_counter() - start
+    result = json.loads(out.strip().splitlines()[-1])
+    if "missing" in result:
+        missing = result["missing"].split(".")[0]
+        if missing not in THIRD_PARTY:
+            pytest.fail(f"{command}: cannot import {result['missing']!r}")
+        pytest.skip(f"{missing} is not installed")
+    return elapsed, result
+
+
+def test_budgets_cover_all_subcommands():
+    assert set(BUDGETS) == set(LAZY_IMPORTS)
+
+
+@pytest.mark.parametrize("command", sorted(LAZY_IMPORTS))
+def test_startup_budget(command):
+    seconds, result = _run_child(command)
+
+    leaked = sorted(set(FORBIDDEN_MODULES) & set(result["modules"]))
+    assert not leaked, f"{command} imports {leaked} at startup"
+
+    max_seconds, max_rss_mb = BUDGETS[command]
+    assert seconds <= max_seconds, f"{command} cold start {seconds:.2f}s > {max_seconds}s"
+    assert result["rss_mb"] <= max_rss_mb, f"{command} RSS {result['rss_mb']:.1f}MB > {max_rss_mb}MB"
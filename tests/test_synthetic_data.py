@@ -0,0 +1,62 @@
+# test_synthetic_data.py
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from synthetic_data import MeterProfile, SyntheticMeterGenerator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = """
+import json, resource, sys
+from synthetic_data import MeterProfile, SyntheticMeterGenerator
+years, out = int(sys.argv[1]), sys.argv[2]
+generator = SyntheticMeterGenerator(MeterProfile.fit(), n_devices=1000, years=years)
+generator.write_npy(out + "/power.npy", out + "/weather.csv")
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"rss_mb": rss / (1024 * 1024 if sys.platform == "darwin" else 1024)}))
+"""
+
+
+def _peak_rss_mb(years, out_dir):
+    out = subprocess.run([sys.executable, "-c", _CHILD, str(years), str(out_dir)], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])["rss_mb"]
+
+
+def test_write_npy_memory_stays_flat(tmp_path):
+    small, large = tmp_path / "small", tmp_path / "large"
+    small.mkdir()
+    large.mkdir()
+    rss_small = _peak_rss_mb(1, small)
+    rss_large = _peak_rss_mb(6, large)
+
+    # 파일 크기 차이는 약 175MB. 메모리가 일정하면 peak RSS 차이는 그보다 훨씬 작아야 함
+    file_growth_mb = (os.path.getsize(large / "power.npy") - os.path.getsize(small / "power.npy")) / 2 ** 20
+    assert file_growth_mb > 150
+    assert rss_large - rss_small < 40, f"peak RSS {rss_small:.1f}MB -> {rss_large:.1f}MB"
+
+
+def test_write_npy_matches_write_csv(tmp_path):
+    generator = SyntheticMeterGenerator(MeterProfile.fit(), n_devices=7, years=1, seed=3,
+                                        chunk_days=5, device_chunk=3)
+    generator.write_npy(tmp_path / "power.npy", tmp_path / "weather_npy.csv")
+    generator.write_csv(tmp_path / "power.csv", tmp_path / "weather_csv.csv")
+
+    array = np.load(tmp_path / "power.npy")
+    df = pd.read_csv(tmp_path / "power.csv")
+    assert array.shape == (generator.n_hours, generator.n_devices)
+    assert len(df) == array.size
+    # CSV 행 순서는 청크 순서를 따르므로 (시간, 기기) 로 피벗해서 비교. 값은 소수점 셋째 자리까지 저장
+    table = df.pivot(index="StartDate", columns="device_id", values="Value (kWh)")
+    assert list(table.columns) == list(generator.device_ids)
+    np.testing.assert_allclose(table.to_numpy(), array, atol=5e-4)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "weather_npy.csv"),
+                                  pd.read_csv(tmp_path / "weather_csv.csv"))